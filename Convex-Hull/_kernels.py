@@ -0,0 +1,209 @@
+import numpy as np
+from numba import njit, int64, float64
+
+# every kernel is compiled eagerly at import for both point dtypes DataCloud stores:
+# int64 for integer clouds (exact cross products) and float64 for the others
+
+@njit([int64(int64[:, :], int64), int64(float64[:, :], int64)], cache=True)
+def next_hull_point(pts, cur_idx):
+    """
+    gift wrapping step, jarvis march inner loop compiled by numba:
+        * pts is a (N, 2) int64 or float64 array, cur_idx the index of the current hull point
+        * scan all points once, keep the most counterclockwise one to vector{cur}{nxt}
+        * if paralle, keep the furthest one on the same ray
+        return: index of the next hull point
+    """
+    n = pts.shape[0]
+    cx = pts[cur_idx, 0]
+    cy = pts[cur_idx, 1]
+    nxt = 1 if cur_idx == 0 else 0
+    for i in range(n):
+        if i == cur_idx:
+            continue
+        ax = pts[nxt, 0] - cx
+        ay = pts[nxt, 1] - cy
+        bx = pts[i, 0] - cx
+        by = pts[i, 1] - cy
+        cv = ax * by - ay * bx
+        if cv > 0:
+            nxt = i
+        elif cv == 0 and ax * bx + ay * by >= 0 and bx * bx + by * by > ax * ax + ay * ay:
+            nxt = i
+    return nxt
+
+@njit([int64(int64[:, :], int64, int64, int64), float64(float64[:, :], int64, int64, int64)], cache=True)
+def _cross(pts, o, a, b):
+    """
+    cross product of vector{o}{a} and vector{o}{b}, o, a, b are row indices of pts
+    """
+    return (pts[a, 0] - pts[o, 0]) * (pts[b, 1] - pts[o, 1]) - (pts[a, 1] - pts[o, 1]) * (pts[b, 0] - pts[o, 0])
+
+@njit([int64[:](int64[:, :]), int64[:](float64[:, :])], cache=True)
+def monotone_chain_hull(pts):
+    """
+    monotone chain compiled by numba, the hull is a stack of row indices in one buffer:
+        * pts is a (N, 2) int64 or float64 array sorted by x, then y
+        * lower hull from left to right, then upper hull from right to left
+        * pop out while the turn is right or collinear
+        return: indices of the ccw hull, the first index appended at the tail for closure
+    """
+    n = pts.shape[0]
+    hull = np.empty(2 * n, dtype=np.int64)
+    k = 0
+    # create lower hull
+    for i in range(n):
+        while k >= 2 and _cross(pts, hull[k - 2], hull[k - 1], i) <= 0:
+            k -= 1
+        hull[k] = i
+        k += 1
+    # create upper hull, never pop the lower one
+    lower_size = k + 1
+    for i in range(n - 2, -1, -1):
+        while k >= lower_size and _cross(pts, hull[k - 2], hull[k - 1], i) <= 0:
+            k -= 1
+        hull[k] = i
+        k += 1
+    return hull[:k]
+
+@njit([int64[:](int64[:, :], int64[:]), int64[:](float64[:, :], int64[:])], cache=True)
+def settle_angle_order(pts, order):
+    """
+    insertion sort with the exact cross product, in place:
+        * order is the pivot index first, then the other indices already sorted by float angle keys
+        * only near-collinear points can be out of place, so it moves a few of them; O(n) in practice
+        * b goes before a if vector{pivot}{b} is clockwise to vector{pivot}{a}, or nearer if paralle
+        return: order
+    """
+    n = order.shape[0]
+    p = order[0]
+    for i in range(2, n):
+        b = order[i]
+        j = i
+        while j > 1:
+            a = order[j - 1]
+            cv = _cross(pts, p, a, b)
+            if cv > 0:
+                break
+            if cv == 0:
+                da = (pts[a, 0] - pts[p, 0]) ** 2 + (pts[a, 1] - pts[p, 1]) ** 2
+                db = (pts[b, 0] - pts[p, 0]) ** 2 + (pts[b, 1] - pts[p, 1]) ** 2
+                if da <= db:
+                    break
+            order[j] = a
+            j -= 1
+        order[j] = b
+    return order
+
+@njit([int64[:](int64[:, :]), int64[:](float64[:, :])], cache=True)
+def graham_scan_core(pts):
+    """
+    graham scan stack loop compiled by numba, the stack holds row indices:
+        * pts is a (N, 2) int64 or float64 array, the pivot first, then sorted by ccw angle (nearer first if paralle)
+        * pop out while the turn is right or collinear
+        return: indices of the hull points left on the stack, ccw from the pivot
+    """
+    n = pts.shape[0]
+    stack = np.empty(n, dtype=np.int64)
+    top = -1
+    for i in range(n):
+        while top >= 1 and _cross(pts, stack[top - 1], stack[top], i) <= 0:
+            top -= 1
+        top += 1
+        stack[top] = i
+    return stack[:top + 1]
+
+@njit([int64[:](int64[:, :]), int64[:](float64[:, :])], cache=True)
+def quickhull_hull(pts):
+    """
+    quickhull compiled by numba, the recursion is a stack of tasks (i1, i2, lo, hi):
+        * pts is a (N, 2) int64 or float64 array sorted by x, then y; N >= 3
+        * a = 0 and b = N - 1 are hull vertices, idx[lo:hi] holds the points left to vector{i1}{i2}
+        * take the farthest point, partition idx[lo:hi] in place into the points left to
+          vector{i1}{farthest} and the ones left to vector{farthest}{i2}, drop the others
+        * the hull points are marked; in x order, the lower ones go from a to b and the upper ones back
+        return: indices of the ccw hull from a, the first index appended at the tail for closure
+    """
+    n = pts.shape[0]
+    a = 0
+    b = n - 1
+    on_hull = np.zeros(n, dtype=np.bool_)
+    on_hull[a] = True
+    on_hull[b] = True
+    upper = np.zeros(n, dtype=np.bool_)
+
+    # upper ( cross(a,b,p) > 0 ) first, then lower ( cross(a,b,p) < 0 )
+    idx = np.empty(n, dtype=np.int64)
+    m = 0
+    for i in range(n):
+        if _cross(pts, a, b, i) > 0:
+            idx[m] = i
+            upper[i] = True
+            m += 1
+    n_upper = m
+    for i in range(n):
+        if _cross(pts, a, b, i) < 0:
+            idx[m] = i
+            m += 1
+
+    tasks = np.empty((2 * n + 2, 4), dtype=np.int64)
+    tasks[0, 0], tasks[0, 1], tasks[0, 2], tasks[0, 3] = a, b, 0, n_upper
+    tasks[1, 0], tasks[1, 1], tasks[1, 2], tasks[1, 3] = b, a, n_upper, m
+    top = 2
+    while top > 0:
+        top -= 1
+        i1, i2, lo, hi = tasks[top, 0], tasks[top, 1], tasks[top, 2], tasks[top, 3]
+        if lo >= hi:
+            continue
+
+        # find the farthest point to vector p1->p2; if paralle, the one nearest to p1 along it,
+        # a farthest point in the middle of a hull edge is not a vertex
+        dx = pts[i2, 0] - pts[i1, 0]
+        dy = pts[i2, 1] - pts[i1, 1]
+        far = idx[lo]
+        far_cv = _cross(pts, i1, i2, far)
+        far_proj = (pts[far, 0] - pts[i1, 0]) * dx + (pts[far, 1] - pts[i1, 1]) * dy
+        for j in range(lo + 1, hi):
+            p = idx[j]
+            cv = _cross(pts, i1, i2, p)
+            if cv < far_cv:
+                continue
+            proj = (pts[p, 0] - pts[i1, 0]) * dx + (pts[p, 1] - pts[i1, 1]) * dy
+            if cv > far_cv or proj < far_proj:
+                far = p
+                far_cv = cv
+                far_proj = proj
+        on_hull[far] = True
+
+        # divide into two parts, in place
+        mid = lo
+        for j in range(lo, hi):
+            p = idx[j]
+            if _cross(pts, i1, far, p) > 0:
+                idx[j] = idx[mid]
+                idx[mid] = p
+                mid += 1
+        end = mid
+        for j in range(mid, hi):
+            p = idx[j]
+            if _cross(pts, far, i2, p) > 0:
+                idx[j] = idx[end]
+                idx[end] = p
+                end += 1
+
+        tasks[top, 0], tasks[top, 1], tasks[top, 2], tasks[top, 3] = i1, far, lo, mid
+        tasks[top + 1, 0], tasks[top + 1, 1], tasks[top + 1, 2], tasks[top + 1, 3] = far, i2, mid, end
+        top += 2
+
+    # a -> lower chain -> b -> upper chain -> a
+    hull = np.empty(n + 1, dtype=np.int64)
+    k = 0
+    for i in range(n):
+        if on_hull[i] and not upper[i]:
+            hull[k] = i
+            k += 1
+    for i in range(n - 2, -1, -1):
+        if on_hull[i] and upper[i]:
+            hull[k] = i
+            k += 1
+    hull[k] = a
+    return hull[:k + 1]
@@ -1,12 +1,48 @@
-import math
-from functools import cmp_to_key
+from functools import cached_property
+import numpy as np
+from scipy.spatial import ConvexHull, QhullError
+from _kernels import next_hull_point, monotone_chain_hull, graham_scan_core, settle_angle_order, quickhull_hull
 
 class DataCloud:
     def __init__(self, points=None):
-        self.points = points if points is not None else []
+        self.set_points(points if points is not None else [])
     
     def set_points(self, points):
-        self.points = points
+        """
+        store the cloud once as a contiguous (N, 2) array, self.pts, list or ndarray input;
+        all algorithms work on it, (x, y) tuples are only built at the API boundary
+            * integer points stay int64: cross products are exact while |x|, |y| < 2**30
+            * everything else is float64
+        """
+        pts = np.asarray(points)
+        if np.issubdtype(pts.dtype, np.integer) and (pts.size == 0 or np.abs(pts).max() < 2**30):
+            self.pts = np.asarray(pts, dtype=np.int64).reshape(-1, 2)
+        else:
+            self.pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
+        # drop the tuples cached for the previous cloud
+        self.__dict__.pop('_as_tuples', None)
+    
+    @cached_property
+    def _as_tuples(self):
+        """
+        list of (x, y) tuples of the cloud, built once on demand for the legacy paths
+        """
+        return self.to_tuples(self.pts)
+    
+    @property
+    def points(self):
+        return self._as_tuples
+    
+    @points.setter
+    def points(self, points):
+        self.set_points(points)
+    
+    @staticmethod
+    def to_tuples(arr):
+        """
+        rows of a (N, 2) array as a list of (x, y) tuples of python numbers, for the returned hulls
+        """
+        return list(map(tuple, np.asarray(arr).tolist()))
     
     @staticmethod
     def cross(o, a, b):
@@ -30,13 +66,95 @@ class DataCloud:
         distance, |ab|^2
         """
         return (a[0] - b[0])**2 + (a[1] - b[1])**2
+
+    @staticmethod
+    def cross_vec(o, a, B):
+        """
+        vectorized cross: orientation of (o, a, b) for every row b of the (N, 2) array B
+        """
+        return (a[0] - o[0]) * (B[:, 1] - o[1]) - (a[1] - o[1]) * (B[:, 0] - o[0])
+
+    @staticmethod
+    def apply_step(hull, step):
+        """
+        replay one step recorded with return_steps=True on the running hull list, in place:
+            ('push', p): append p at the tail
+            ('pop',): remove the tail
+            ('insert', q, p): insert p right after q
+        """
+        if step[0] == 'push':
+            hull.append(step[1])
+        elif step[0] == 'pop':
+            hull.pop()
+        else:
+            hull.insert(hull.index(step[1]) + 1, step[2])
+        return hull
+
+    @staticmethod
+    def pseudo_angle(dx, dy):
+        """
+        pseudo angle of the non zero vectors (dx, dy), without atan2 ("fake atan2"):
+        walk along the diamond |x| + |y| = 1 instead of the unit circle, no transcendental call
+            * a value in [0, 4), starting from the +x axis, 1 per quadrant
+            * it grows with the ccw angle, so sorting by it sorts by angle
+        """
+        s = np.abs(dx) + np.abs(dy)
+        t, u = dx / s, dy / s
+        return np.select([(dy >= 0) & (dx >= 0), dy >= 0, dx < 0], [u, 1 - t, 2 - u], 3 + t)
+
+    @staticmethod
+    def _akl_filter(pts):
+        """
+        Akl-Toussaint heuristic: return a boolean mask of the points to keep
+          1. take the 8 extreme points, argmin/argmax of x, y, x+y, x-y
+          2. they are on the hull, connect them ccw into an octagon
+          3. points strictly inside the octagon can not be on the hull, drop them
+                 * -- *
+               /   x  \
+              *  x  x  *     x: dropped
+              *   x    *
+               \  x   /
+                 * -- *
+        """
+        keep = np.ones(len(pts), dtype=bool)
+        if len(pts) < 3:
+            return keep
+        x, y = pts[:, 0], pts[:, 1]
+        # extremes in ccw order, starting from the bottom
+        octagon = pts[[np.argmin(y), np.argmax(x - y), np.argmax(x), np.argmax(x + y),
+                       np.argmax(y), np.argmin(x - y), np.argmin(x), np.argmin(x + y)]]
+        # an extreme point can be extreme in several directions, remove repeated vertices
+        octagon = octagon[np.any(octagon != np.roll(octagon, 1, axis=0), axis=1)]
+        if len(octagon) < 3:
+            return keep
+        inside = np.ones(len(pts), dtype=bool)
+        for v1, v2 in zip(octagon, np.roll(octagon, -1, axis=0)):
+            inside &= DataCloud.cross_vec(v1, v2, pts) > 0
+        return ~inside
+
+    def _hull_input(self, use_akl):
+        """
+        (N, 2) array of the points the algorithms run on
+            * Akl-Toussaint filtered first if use_akl, repeated points do not break the filter
+            * sorted by x, then y, so a repeated point ends up next to its copies
+            * duplicate points removed, by comparing adjacent rows
+        """
+        pts = self.pts
+        if use_akl:
+            pts = pts[self._akl_filter(pts)]
+        pts = pts[np.lexsort((pts[:, 1], pts[:, 0]))]
+        if len(pts) > 1:
+            new = np.ones(len(pts), dtype=bool)
+            new[1:] = np.any(pts[1:] != pts[:-1], axis=1)
+            pts = pts[new]
+        return pts
     
     def reorder_ccw(self, hull):
         """
         reorder counterclockwise: sort points on the hull by counterclockwise
           1. remove duplicate points
           2. find the most left buttom one
-          3. take the pivot as the center, use arctan to implement priorityqueue
+          3. take the pivot as the center, sort by polar keys to implement priorityqueue
           4. let pivot be the first element
           5. implement at the tail of the stack to ensure closure
         """
@@ -47,32 +165,30 @@ class DataCloud:
             hull.append(hull[0])
             return hull
 
-        # if the first == last, ensure the closure
-        if hull[0] == hull[-1]:
-            hull = hull[:-1]
+        # 1. remove duplicate points (also the closure, first == last)
+        H = np.asarray(hull, dtype=np.float64)
+        _, unique = np.unique(H, axis=0, return_index=True)
         
         # 2. take the most left buttom pivot
-        pivot = min(hull, key=lambda p: (p[0], p[1]))
+        pivot = unique[np.lexsort((H[unique, 1], H[unique, 0]))[0]]
         
         # 3. sort all points except for pivot
-        others = [p for p in hull if p != pivot]
+        others = unique[unique != pivot]
         
-        def polar_angle(p):
-            # atan2(Δy, Δx) => ccw angle
-            return math.atan2(p[1] - pivot[1], p[0] - pivot[0])
+        # every other point is in (-90°, 90°] from the left pivot: rotate by +90°
+        # so the pseudo angle starts pointing down, (dx, dy) -> (-dy, dx)
+        d = H[others] - H[pivot]
+        angle = self.pseudo_angle(-d[:, 1], d[:, 0])
         
         # edge case, if two points have same ccw angle, sorted by distance
-        others_sorted = sorted(
-            others,
-            key=lambda p: (polar_angle(p), -self.dist_sq(pivot, p))
-        )
+        order = others[np.lexsort((-(d**2).sum(axis=1), angle))]
         
         # convex closure tuple [pivot] + sorted(others) + [pivot]
-        final = [pivot] + others_sorted + [pivot]
+        final = [hull[pivot]] + [hull[i] for i in order] + [hull[pivot]]
         return final
 
 
-    def graham_scan(self, return_steps=False):
+    def graham_scan(self, return_steps=False, use_akl=True):
         """
         graham scan algorithm (greedy):
             1. find the lowest far left point as the starting point; O(n)
@@ -81,55 +197,52 @@ class DataCloud:
                 * if right and collinear, jump out of mono stack
                 * if left, jump in the mono stack
         
-            if return_steps = True, return a turple containing all iteration works, for visualization
+            if return_steps = False, the stack loop runs in a numba kernel
+            if return_steps = True, return the list of stack operations ('push', p) / ('pop',)
+            for visualization, replay them with apply_step
+            if use_akl = True, drop the points inside the Akl-Toussaint octagon first
         """
-        steps = []
         # steps for visualization
-        if return_steps:
-            steps.append(self.points.copy())
+        steps = []
 
-        if len(self.points) < 3:
-            return [self.points.copy()] if return_steps else self.points.copy()
+        pts = self._hull_input(use_akl)
+        if len(pts) < 3:
+            points = self.to_tuples(pts)
+            return [('push', p) for p in points] if return_steps else points
         
         # find the y min point, take x min if two are paralle
-        pivot = min(self.points, key=lambda p: (p[1], p[0]))
+        pivot_idx = np.lexsort((pts[:, 0], pts[:, 1]))[0]
         
-        # sort by ccw angle; edge case: if two's ccw angles are same, sort by distance, take further one
-        def compare(a, b):
-            cp = self.cross(pivot, a, b)
-            if cp == 0:
-                return self.dist_sq(pivot, b) - self.dist_sq(pivot, a)
-            return -1 if cp > 0 else 1  # cp>0 表示a在b的逆时针方向，应排在前面
+        # sort by ccw angle; edge case: if two's ccw angles are same, sort by distance, nearer first,
+        # so the nearer one is popped out by the further one in the scan
+        others = np.flatnonzero(np.any(pts != pts[pivot_idx], axis=1))
+        d = pts[others] - pts[pivot_idx]
+        # every other point is in [0°, 180°) from the lowest pivot, so no quadrant key is needed:
+        # -dx/dy alone grows with the angle, -inf on the +x axis
+        slope = np.divide(-d[:, 0], d[:, 1], out=np.full(len(d), -np.inf), where=d[:, 1] > 0)
+        order = others[np.lexsort(((d**2).sum(axis=1), slope))]
+        # float keys can not split near-collinear points, settle them with the exact cross product
+        order = settle_angle_order(pts, np.r_[pivot_idx, order].astype(np.int64))
+        sorted_pts = pts[order]
         
-        sorted_points = sorted([p for p in self.points if p != pivot], key=cmp_to_key(compare))
-        sorted_points = [pivot] + sorted_points
+        if not return_steps:
+            # convex closure
+            stack = graham_scan_core(sorted_pts)
+            return self.to_tuples(sorted_pts[np.r_[stack, stack[:1]]])
         
         # stack stores convex point for visualization
         stack = []
-        for p in sorted_points:
+        for p in self.to_tuples(sorted_pts):
             # if the point is non left to vector{stack[0][1]}, pop out
             while len(stack) >= 2 and self.cross(stack[-2], stack[-1], p) <= 0:
                 stack.pop()
-                if return_steps:
-                    steps.append(stack.copy())
+                steps.append(('pop',))
             stack.append(p)
-            if return_steps:
-                steps.append(stack.copy())
-        
-        # convex closure
-        hull = stack + [stack[0]]
+            steps.append(('push', p))
         
-        if return_steps:
-            # store convex closure points
-            for i in range(len(steps)):
-                if len(steps[i]) > 1:
-                    steps[i] = steps[i] + [steps[i][0]]
-            steps.append(hull)
-            return steps
-        else:
-            return hull
+        return steps
 
-    def jarvis_march(self, return_steps=False):
+    def jarvis_march(self, return_steps=False, use_akl=True):
         """
         jarvish march algorithm (greedy):
             * starting from the far left bottom point; O(n)
@@ -140,53 +253,42 @@ class DataCloud:
              *  *  *  *
               \  *  * |
                *----- *
+
+            if return_steps = True, return the list of ('push', p) for visualization, see apply_step
         """
+        # steps for visualization
         steps = []
-        # stack stores convex points
-        if return_steps:
-            steps.append(self.points.copy())
 
-        n = len(self.points)
-        if n < 3:
-            return [self.points.copy()] if return_steps else self.points.copy()
+        pts = self._hull_input(use_akl)
+        if len(pts) < 3:
+            points = self.to_tuples(pts)
+            return [('push', p) for p in points] if return_steps else points
         
+        # hull stores the indices of convex points
         hull = []
-        # find the most left point as the starting
-        leftmost = min(self.points, key=lambda p: p[0])
+        # find the most left point as the starting, take y min if two are paralle;
+        # the input is sorted by x, then y, so it is the first one
+        leftmost = 0
         current = leftmost
         
         while True:
             hull.append(current)
             if return_steps:
-                steps.append(hull.copy())
+                steps.append(('push', tuple(pts[current].tolist())))
             
-            # find the next point that all next points are left to it.
-            # Maybe I can use recursion to implement this?
-            next_point = self.points[0]
-            for p in self.points[1:]:
-                cross_val = self.cross(current, next_point, p)
-                # if cross<0, p is left to next point, sorted by distance if paralle
-                if cross_val > 0 or (
-                    cross_val == 0 and self.dist_sq(current, p) > self.dist_sq(current, next_point)):
-                        next_point = p
+            # find the next point that all next points are left to it (numba kernel)
+            next_point = next_hull_point(pts, current)
             
             current = next_point
             if current == leftmost:
                 break
         
-        hull.append(hull[0]) # convex closure
-        
         if return_steps:
-            # ensure convex closure
-            for i in range(len(steps)):
-                if len(steps[i]) > 1:
-                    steps[i] = steps[i] + [steps[i][0]]
-            steps.append(hull)
             return steps
         else:
-            return hull
+            return self.to_tuples(pts[hull + [hull[0]]]) # convex closure
 
-    def quickhull(self, return_steps=False):
+    def quickhull(self, return_steps=False, use_akl=True):
         """
         QuickHull algorithm (use pivot but more like mergeSort):
             * find the most left and most right points; O(n)
@@ -203,82 +305,77 @@ class DataCloud:
                  \ * /
                   \ /
                    * <-- d
+
+            if return_steps = False, the recursion runs as a task stack in a numba kernel
+            if return_steps = True, return the list of ('push', p) / ('insert', q, p) for visualization:
+            a and b are pushed, then every farthest point is inserted between its two parents
         """
+        # steps for visualization
         steps = []
         
-        # store the starting point
-        if return_steps:
-            steps.append(self.points.copy())
+        pts = self._hull_input(use_akl)
         
         # closure condition
-        if len(self.points) < 3:
-            if len(self.points) == 2 and self.points[0] != self.points[1]:
-                hull = self.points[:] + [self.points[0]]
+        if len(pts) < 3:
+            points = self.to_tuples(pts)
+            if len(points) == 2:
+                hull = points[:] + [points[0]]
             else:
-                hull = self.points[:]
+                hull = points[:]
             if return_steps:
-                return [hull]
+                return [('push', p) for p in hull]
             else:
                 return hull
         
-        # 1. find a = x_min, b = x_max, two extreme points
-        a = min(self.points, key=lambda p: p[0])
-        b = max(self.points, key=lambda p: p[0])
+        # 1. find a = x_min, b = x_max, two extreme points; take y min / y max if paralle,
+        # so a and b are always hull vertices; the input is sorted by x, then y
+        a, b = 0, len(pts) - 1
         
-        # upper ( cross(a,b,p) > 0 ) and lower( cross(a,b,p) < 0 )
-        upper = [p for p in self.points if self.cross(a, b, p) > 0]
-        lower = [p for p in self.points if self.cross(a, b, p) < 0]
+        if not return_steps:
+            return self.to_tuples(pts[quickhull_hull(pts)])
         
-        def _hull(p1, p2, pts):
+        # upper ( cross(a,b,p) > 0 ) and lower( cross(a,b,p) < 0 ), as index arrays
+        idx = np.arange(len(pts))
+        cross_ab = self.cross_vec(pts[a], pts[b], pts)
+        upper = idx[cross_ab > 0]
+        lower = idx[cross_ab < 0]
+        
+        # tuples are only needed to record the steps
+        points = self.to_tuples(pts)
+        
+        def _hull(i1, i2, idx):
             """
-            recursively find the farthest point in subsets
+            recursively find the farthest point in subsets, vectorized over the index array idx,
+            record the insert steps
             """
-            if not pts:
+            if idx.size == 0:
                 return []
             
-            # find the farthest point to vector p1->p2
-            max_dist = -1
-            farthest = None
-            for pt in pts:
-                dist = abs(self.cross(p1, p2, pt))
-                if dist > max_dist:
-                    max_dist = dist
-                    farthest = pt
-            
-            # divide into two parts
-            pts_left = [p for p in pts if self.cross(p1, farthest, p) > 0]
-            pts_right = [p for p in pts if self.cross(farthest, p2, p) > 0]
+            # find the farthest point to vector p1->p2, every point of idx is left to it;
+            # if paralle, the one nearest to p1 along it, the middle of a hull edge is not a vertex
+            sub = pts[idx]
+            cv = self.cross_vec(pts[i1], pts[i2], sub)
+            far = np.flatnonzero(cv == cv.max())
+            farthest = idx[far[np.argmin((sub[far] - pts[i1]) @ (pts[i2] - pts[i1]))]]
+            steps.append(('insert', points[i1], points[farthest]))
             
-            left_hull = _hull(p1, farthest, pts_left)
-            right_hull = _hull(farthest, p2, pts_right)
+            # divide into two parts, a point left to p1->farthest can not also be left to farthest->p2
+            left = self.cross_vec(pts[i1], pts[farthest], sub) > 0
+            rest = idx[~left]
+            idx_right = rest[self.cross_vec(pts[farthest], pts[i2], pts[rest]) > 0]
             
-            sub_hull = left_hull + [farthest] + right_hull
-            
-            if return_steps:
-                # store steps for visualization
-                if len(sub_hull) > 0:
-                    # ensure convex closure
-                    steps.append(sub_hull + [sub_hull[0]])
-            return sub_hull
+            _hull(i1, farthest, idx[left])
+            _hull(farthest, i2, idx_right)
         
-        # upper hull caller and lower hull caller
-        upper_hull = _hull(a, b, upper)
-        lower_hull = _hull(b, a, lower)
-        
-        # merge two hulls 
-        full_hull = [a] + upper_hull + [b] + lower_hull + [a]
+        steps += [('push', points[a]), ('push', points[b])]
         
-        # ccw all points
-        final_hull = self.reorder_ccw(full_hull)
+        # upper hull caller and lower hull caller
+        _hull(a, b, upper)
+        _hull(b, a, lower)
         
-        if return_steps:
-            # steps store all ccw points
-            steps.append(final_hull)
-            return steps
-        else:
-            return final_hull
+        return steps
 
-    def monotone_chain(self, return_steps=False):
+    def monotone_chain(self, return_steps=False, use_akl=True):
         """
         Monotone Chain Algorithm (greedy; PriorityQueue):
             * sort points from left to right, x_min to x_max; O(nlogn)
@@ -292,53 +389,63 @@ class DataCloud:
              \  *    *     /
               * --> * --> *
 
+            if return_steps = False, the two chains are built by a numba kernel
+            if return_steps = True, return the list of stack operations ('push', p) / ('pop',)
+            for visualization, the upper hull is stacked on the lower hull; see apply_step
         """
+        # steps for visualization
         steps = []
-        # store steps for visualization
-        if return_steps:
-            steps.append(self.points.copy())
 
-        # PriorityQueue of x, if x paralle then append bigger y
-        points = sorted(self.points, key=lambda p: (p[0], p[1]))
-        if len(points) < 3:
-            hull = points + [points[0]]  # ensure closure
+        # PriorityQueue of x, if x paralle then append bigger y; _hull_input sorts it already
+        pts = self._hull_input(use_akl)
+        if len(pts) < 3:
+            hull = self.to_tuples(pts)
+            hull = hull + hull[:1]  # ensure closure
             if return_steps:
-                return [hull]
+                return [('push', p) for p in hull]
             else:
                 return hull
+        
+        if not return_steps:
+            return self.to_tuples(pts[monotone_chain_hull(pts)])
+        
+        # tuples are only needed to record the steps
+        points = self.to_tuples(pts)
 
         # create lower hull
-        lower = []
+        stack = []
         for p in points:
-            while len(lower) >= 2 and self.cross(lower[-2], lower[-1], p) <= 0:
-                lower.pop()
-                if return_steps:
-                    steps.append(lower.copy())
-            lower.append(p)
-            if return_steps:
-                steps.append(lower.copy())
+            while len(stack) >= 2 and self.cross(stack[-2], stack[-1], p) <= 0:
+                stack.pop()
+                steps.append(('pop',))
+            stack.append(p)
+            steps.append(('push', p))
         
-        # create upper hull
-        upper = []
-        for p in reversed(points):
-            while len(upper) >= 2 and self.cross(upper[-2], upper[-1], p) <= 0:
-                upper.pop()
-                if return_steps:
-                    steps.append(upper.copy())
-            upper.append(p)
-            if return_steps:
-                steps.append(upper.copy())
+        # create upper hull on top of it, never pop the lower hull
+        lower_size = len(stack) + 1
+        for p in reversed(points[:-1]):
+            while len(stack) >= lower_size and self.cross(stack[-2], stack[-1], p) <= 0:
+                stack.pop()
+                steps.append(('pop',))
+            stack.append(p)
+            steps.append(('push', p))
         
-        # merge two hulls
-        full_hull = lower[:-1] + upper[:-1]
-        hull_closed = full_hull + [full_hull[0]]
+        return steps
+
+    def qhull(self):
+        """
+        production path: scipy.spatial.ConvexHull, the Qhull C library
+            * the four algorithms above are kept for the visualization and the comparison plots
+            * 2-D vertices of Qhull are already ccw, rotate them to start at the most left buttom point
+            * Qhull rejects degenerate clouds (< 3 points, all collinear), monotone chain handles them
+            return: ccw hull as (x, y) tuples, the first point appended at the tail for closure
+        """
+        try:
+            order = ConvexHull(self.pts).vertices
+        except (QhullError, ValueError):
+            return self.monotone_chain()
         
-        if return_steps:
-            # stores each steps of hull
-            for i in range(len(steps)):
-                if len(steps[i]) > 1:
-                    steps[i] = steps[i] + [steps[i][0]]
-            steps.append(hull_closed)
-            return steps
-        else:
-            return hull_closed
+        pts = self.pts[order]
+        start = np.lexsort((pts[:, 1], pts[:, 0]))[0]
+        order = np.roll(order, -start)
+        return self.to_tuples(self.pts[np.r_[order, order[:1]]])
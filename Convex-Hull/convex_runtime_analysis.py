@@ -1,25 +1,34 @@
 import os
-import random
 import time
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import numpy as np
 from convex_hull_api import DataCloud
 
+ALGORITHMS = {
+    "Graham Scan": DataCloud.graham_scan,
+    "Jarvis March": DataCloud.jarvis_march,
+    "QuickHull": DataCloud.quickhull,
+    "Monotone Chain": DataCloud.monotone_chain
+}
+
+# production path, plotted as a reference line next to the 4 algorithms
+REFERENCE = {
+    "Qhull (scipy)": DataCloud.qhull
+}
+
 def generate_points(n, x_range=(0, 1), y_range=(0, 1), distribution='uniform', seed=0):
-    random.seed(seed)
-    points = []
-    
-    for _ in range(n):
-        if distribution == 'uniform':
-            x = random.uniform(x_range[0], x_range[1])
-            y = random.uniform(y_range[0], y_range[1])
-        elif distribution == 'gaussian':
-            x = random.gauss(0, 1)
-            y = random.gauss(0, 1)
-        else:
-            raise ValueError("Invalid distribution type. Choose 'uniform' or 'gaussian'.")
-        
-        points.append((x, y))
+    """
+    generate n points as one (n, 2) float64 array, DataCloud takes it without conversion
+    """
+    rng = np.random.default_rng(seed)
+    
+    if distribution == 'uniform':
+        points = rng.uniform((x_range[0], y_range[0]), (x_range[1], y_range[1]), size=(n, 2))
+    elif distribution == 'gaussian':
+        points = rng.standard_normal((n, 2))
+    else:
+        raise ValueError("Invalid distribution type. Choose 'uniform' or 'gaussian'.")
     
     return points
 
@@ -30,13 +39,17 @@ def measure_runtime(algo_func, points):
     end = time.perf_counter()
     return end - start
 
+def run_one_trial(args):
+    """
+    one Monte-Carlo trial, top level so worker processes can pickle it:
+    args = (seed, n, x_range, y_range, distribution), return {algo_name: elapsed}
+    """
+    seed, n, x_range, y_range, distribution = args
+    points = generate_points(n, x_range, y_range, distribution, seed=seed)
+    return {algo_name: measure_runtime(algo_method, points) for algo_name, algo_method in ALGORITHMS.items()}
+
 def run_analysis(ns, x_range, y_range, distribution, seed=0):
-    algorithms = {
-        "Graham Scan": DataCloud.graham_scan,
-        "Jarvis March": DataCloud.jarvis_march,
-        "QuickHull": DataCloud.quickhull,
-        "Monotone Chain": DataCloud.monotone_chain
-    }
+    algorithms = {**ALGORITHMS, **REFERENCE}
     
     runtime_results = {name: [] for name in algorithms.keys()}
     
@@ -65,20 +78,26 @@ def run_analysis(ns, x_range, y_range, distribution, seed=0):
     plt.savefig(filepath)
     plt.show()
 
-def run_distribution_analysis(n=50, x_range=(0, 1), y_range=(0, 1), distribution='uniform', seed=0):
-    algorithms = {
-        "Graham Scan": DataCloud.graham_scan,
-        "Jarvis March": DataCloud.jarvis_march,
-        "QuickHull": DataCloud.quickhull,
-        "Monotone Chain": DataCloud.monotone_chain
-    }
+def run_distribution_analysis(n=50, x_range=(0, 1), y_range=(0, 1), distribution='uniform', seed=0,
+                              trials=100, max_workers=1):
+    algorithms = ALGORITHMS
     
     runtime_data = {name: [] for name in algorithms.keys()}
     
-    for _ in range(100):
-        points = generate_points(n, x_range, y_range, distribution, seed=seed)
-        for algo_name, algo_method in algorithms.items():
-            elapsed = measure_runtime(algo_method, points)
+    # each trial gets its own seed; they run one by one by default, so every trial is timed alone.
+    # max_workers > 1 runs them in a process pool (at most one worker per core): faster for big
+    # workloads, but concurrent trials contend for CPU and cache, which inflates Min/Max/Std Dev
+    tasks = [(seed + i, n, x_range, y_range, distribution) for i in range(trials)]
+    if max_workers == 1:
+        results = [run_one_trial(task) for task in tasks]
+    else:
+        cpus = os.cpu_count() or 1
+        max_workers = min(max_workers or cpus, cpus)
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            results = list(ex.map(run_one_trial, tasks))
+    
+    for trial in results:
+        for algo_name, elapsed in trial.items():
             runtime_data[algo_name].append(elapsed)
     
     output_dir = "runtime_results"
@@ -115,4 +134,5 @@ if __name__ == "__main__":
     run_analysis(ns, (-5, 5), (-5, 5), 'uniform')  
     run_analysis(ns, (-1, 1), (-1, 1), 'gaussian')  
     
+    # trials run one by one for clean timings; max_workers=None (all cores) or > 1 turns the process pool on
     run_distribution_analysis(n=50, x_range=(0, 1), y_range=(0, 1), distribution='uniform')
@@ -2,20 +2,27 @@ import math
 import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-import pandas as pd
+import numpy as np
 from convex_hull_api import DataCloud
 
 def main():
-    # read external file, skip first two rows
+    # read external file, skip the header row
     file_path = "mesh.dat"
-    data = pd.read_csv(file_path, sep='\s+', skiprows=1, header=None, names=["x", "y"])
-    points = list(zip(data["x"], data["y"]))
+    points = np.loadtxt(file_path, skiprows=1)
+
+    # axis limits, the same for all 4 subplots
+    xmin, ymin = points.min(axis=0)
+    xmax, ymax = points.max(axis=0)
 
     dc = DataCloud(points)
-    steps_graham = dc.graham_scan(return_steps=True)
-    steps_jarvis = dc.jarvis_march(return_steps=True)
-    steps_quickhull = dc.quickhull(return_steps=True)
-    steps_monotone = dc.monotone_chain(return_steps=True)
+    # the final hull comes from Qhull, the 4 algorithms are only replayed in the animation
+    hull = dc.qhull()
+
+    # animate on the whole cloud, the Akl-Toussaint filter would leave little more than the hull
+    steps_graham = dc.graham_scan(return_steps=True, use_akl=False)
+    steps_jarvis = dc.jarvis_march(return_steps=True, use_akl=False)
+    steps_quickhull = dc.quickhull(return_steps=True, use_akl=False)
+    steps_monotone = dc.monotone_chain(return_steps=True, use_akl=False)
 
     steps_list = [
         ("Graham Scan", steps_graham),
@@ -26,11 +33,12 @@ def main():
 
     fig, axes = plt.subplots(2, 2, figsize=(10, 10))
     axes = axes.flatten()
+    fig.suptitle(f"{len(points)} points, {len(hull) - 1} on the convex hull (Qhull)")
 
     lines = []  # stores all possible line nections for each algorithm
     for ax, (algo_name, algo_steps) in zip(axes, steps_list):
         # initial datacloud
-        ax.scatter(*zip(*points), s=10, c='blue')
+        ax.scatter(points[:, 0], points[:, 1], s=10, c='blue')
         
         # create a red line
         line, = ax.plot([], [], 'r-', linewidth=1.5)
@@ -40,35 +48,51 @@ def main():
         ax.set_xlabel("X-axis")
         ax.set_ylabel("Y-axis")
         ax.grid(True)
-
-        all_x = data["x"].values
-        all_y = data["y"].values
-        ax.set_xlim(min(all_x) - 1, max(all_x) + 1)
-        ax.set_ylim(min(all_y) - 1, max(all_y) + 1)
+        ax.set_xlim(xmin - 1, xmax + 1)
+        ax.set_ylim(ymin - 1, ymax + 1)
 
     # set up for the animation
     # take the max steps as the animation frame, quicker algorithms just stay the final status
     max_frames = max(len(s[1]) for s in steps_list)
 
+    # running hull of each algorithm, and how many steps are applied to it
+    hulls = [[] for _ in steps_list]
+    applied = [0 for _ in steps_list]
+    # closed hull buffer of each algorithm, line data are column views into it;
+    # 2n + 1 rows are enough for any stack (monotone chain stacks the upper hull on the lower one)
+    buffers = [np.empty((2 * len(points) + 1, 2)) for _ in steps_list]
+
     def init():
-        for line in lines:
+        for i, line in enumerate(lines):
+            hulls[i].clear()
+            applied[i] = 0
             line.set_data([], [])
         return lines
 
     def update(frame):
         """frame update, from 0 to max_frames-1。"""
-        for line, (algo_name, algo_steps) in zip(lines, steps_list):
+        for i, (line, (algo_name, algo_steps)) in enumerate(zip(lines, steps_list)):
             # if steps <= frame，continue
-            idx = min(frame, len(algo_steps) - 1)
-            hull_points = algo_steps[idx]
+            idx = min(frame + 1, len(algo_steps))
+            # the animation restarts, replay from the beginning
+            if idx < applied[i]:
+                hulls[i].clear()
+                applied[i] = 0
+            # apply the steps up to this frame on the running hull
+            for step in algo_steps[applied[i]:idx]:
+                DataCloud.apply_step(hulls[i], step)
+            applied[i] = idx
+            hull_points = hulls[i]
+            k = len(hull_points)
+            buf = buffers[i]
+            buf[:k] = hull_points
 
             # if closured, check head and tail in the stack
-            if len(hull_points) > 1 and hull_points[0] != hull_points[-1]:
-                hull_points = hull_points + [hull_points[0]]
+            if k > 1 and hull_points[0] != hull_points[-1]:
+                buf[k] = buf[0]
+                k += 1
 
-            xdata = [p[0] for p in hull_points]
-            ydata = [p[1] for p in hull_points]
-            line.set_data(xdata, ydata)
+            line.set_data(buf[:k, 0], buf[:k, 1])
 
         return lines
 
@@ -1,6 +1,11 @@
 import unittest
+import numpy as np
 from convex_hull_api import DataCloud
 
+def to_tuples(hull):
+    # compare hulls as lists of (x, y) tuples, whether a list of tuples or a (N, 2) ndarray is returned
+    return [tuple(p) for p in np.asarray(hull).tolist()]
+
 class TestConvexHullAlgorithms(unittest.TestCase):
     def setUp(self):
         # multiple points
@@ -18,45 +23,90 @@ class TestConvexHullAlgorithms(unittest.TestCase):
         hull = dc.graham_scan()
         # (0,0)->(1,0)->(1,1)->(0,1) and closure
         expected_hull = [(0,0),(1,0),(1,1),(0,1),(0,0)]
-        self.assertEqual(hull, expected_hull, "Graham Scan: square hull mismatch.")
+        self.assertEqual(to_tuples(hull), expected_hull, "Graham Scan: square hull mismatch.")
 
     def test_jarvis_march_triangle(self):
         dc = DataCloud(self.points_triangle)
         hull = dc.jarvis_march()
         # (0,0)->(2,0)->(1,1) and closure
         expected_hull = [(0,0),(1,1),(2,0),(0,0)]
-        self.assertEqual(hull, expected_hull, "Jarvis March: triangle hull mismatch.")
+        self.assertEqual(to_tuples(hull), expected_hull, "Jarvis March: triangle hull mismatch.")
 
     def test_quickhull_complex(self):
         dc = DataCloud(self.points_complex)
         hull = dc.quickhull()
         # expect (0,0)->(2,0)->(3,1)->(2,2)->(1,2)->(0,0) and closure
         expected_hull = [(0, 0), (2, 0), (3, 1), (2, 2), (1, 2), (0, 0)]
-        self.assertEqual(hull, expected_hull, "QuickHull: complex hull mismatch.")
+        self.assertEqual(to_tuples(hull), expected_hull, "QuickHull: complex hull mismatch.")
+
+    def test_quickhull_collinear_farthest(self):
+        dc = DataCloud([(0,1), (1,0), (3,0), (5,0), (6,1), (3,3)])
+        # (1,0), (3,0), (5,0) are all the farthest below a->b, (3,0) is not a vertex
+        expected_hull = [(0,1), (1,0), (5,0), (6,1), (3,3), (0,1)]
+        self.assertEqual(to_tuples(dc.quickhull()), expected_hull, "QuickHull: collinear farthest points mismatch.")
 
     def test_monotone_chain_two_points(self):
         dc = DataCloud(self.points_two)
         hull = dc.monotone_chain()
         # only two, closure
         expected_hull = [(3,3), (4,4), (3,3)]
-        self.assertEqual(hull, expected_hull, "Monotone Chain: two points hull mismatch.")
+        self.assertEqual(to_tuples(hull), expected_hull, "Monotone Chain: two points hull mismatch.")
 
     def test_jarvis_march_one_point(self):
         dc = DataCloud(self.points_one)
         hull = dc.jarvis_march()
         # one point, convex is the point 
         expected_hull = [(5,5)]
-        self.assertEqual(hull, expected_hull, "Jarvis March: single point hull mismatch.")
+        self.assertEqual(to_tuples(hull), expected_hull, "Jarvis March: single point hull mismatch.")
+
+    def test_akl_filter(self):
+        # interior points are dropped, the hull does not change
+        points = self.points_square + [(0.5,0.5), (0.25,0.75), (0.75,0.25)]
+        dc = DataCloud(points)
+        keep = DataCloud._akl_filter(dc.pts)
+        self.assertEqual(keep.tolist(), [True]*4 + [False]*3, "Akl-Toussaint: interior points not dropped.")
+        self.assertEqual(to_tuples(dc.monotone_chain()), to_tuples(dc.monotone_chain(use_akl=False)),
+                         "Akl-Toussaint: filtered hull mismatch.")
+
+    def test_repeated_points(self):
+        # every point repeated, the interior one too; jarvis march used to loop forever on them
+        dc = DataCloud(self.points_square * 3 + [(0.5,0.5)] * 2)
+        expected = [(0,0),(0,1),(1,0),(1,1)]
+        for use_akl in (True, False):
+            for algo in (dc.graham_scan, dc.jarvis_march, dc.quickhull, dc.monotone_chain):
+                hull = to_tuples(algo(use_akl=use_akl))
+                self.assertEqual(sorted(hull[:-1]), expected, "Repeated points: hull mismatch.")
+                self.assertEqual(hull[0], hull[-1], "Repeated points: hull not closed.")
+
+    def test_integer_points_exact(self):
+        # (p-1, p) is 1 unit area left to (0,0)->(p, p+1), float cross products round it to collinear
+        p = 10**9 - 1
+        dc = DataCloud([(0,0), (p,p+1), (p-1,p), (p,0)])
+        self.assertEqual(dc.pts.dtype, np.int64, "Integer points should be stored as int64.")
+        for algo in (dc.graham_scan, dc.jarvis_march, dc.quickhull, dc.monotone_chain):
+            self.assertIn((p-1,p), to_tuples(algo()), "Integer points: near collinear vertex lost.")
 
     def test_return_steps(self):
         # test if return expected values
         dc = DataCloud(self.points_square)
         steps = dc.graham_scan(return_steps=True)
-        # steps is a stack list contains iterature procedures
+        # steps is a list of stack operations of the iterature procedures
         self.assertTrue(len(steps) > 0, "Should return at least one step.")
-        # the last point must enclose with the first point
-        self.assertEqual(steps[-1], [(0,0),(1,0),(1,1),(0,1),(0,0)],
+        # replay all steps, the last point must enclose with the first point
+        hull = []
+        for step in steps:
+            DataCloud.apply_step(hull, step)
+        self.assertEqual(to_tuples(hull + hull[:1]), [(0,0),(1,0),(1,1),(0,1),(0,0)],
                          "Graham Scan: final step hull mismatch.")
+
+    def test_qhull_complex(self):
+        dc = DataCloud(self.points_complex)
+        # same ccw order and start point as the other algorithms
+        expected_hull = [(0, 0), (2, 0), (3, 1), (2, 2), (1, 2), (0, 0)]
+        self.assertEqual(to_tuples(dc.qhull()), expected_hull, "Qhull: complex hull mismatch.")
+        # degenerate clouds fall back to monotone chain
+        self.assertEqual(to_tuples(DataCloud(self.points_two).qhull()), [(3,3), (4,4), (3,3)],
+                         "Qhull: two points hull mismatch.")
     
 if __name__ == '__main__':
     unittest.main()
@@ -15,7 +15,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.spatial import Delaunay
-from collections import Counter
 from matplotlib import cm
 
 # -----------------------
@@ -36,7 +35,8 @@ def surface2(x, y):
     return 2 * np.exp(-x**2 - y**2)
 
 def triangle_area(x, y):
-    return np.abs(np.cross(x[1:] - x[0], y[1:] - y[0])) / 2
+    """Triangle areas, vectorized: x, y hold the vertex coordinates with shape (..., 3)."""
+    return np.abs((x[..., 1] - x[..., 0]) * (y[..., 2] - y[..., 0]) - (x[..., 2] - x[..., 0]) * (y[..., 1] - y[..., 0])) / 2
 
 # -----------------------
 # 2. Generate Point Clouds (Step a)
@@ -83,20 +83,23 @@ def generate_closed_surface(x_points=21, y_points=21):
     y = y[indices]
     
     triangles = Delaunay(np.c_[x, y]).simplices
-    triangles = [v for v in triangles if not np.isclose(triangle_area(x[v], y[v]), 0)]
+    triangles = triangles[~np.isclose(triangle_area(x[triangles], y[triangles]), 0)]
     
-    edge_counter = Counter()
-    for vertices in triangles:
-        i1, i2, i3 = sorted(vertices)
-        edge_counter.update([(i1, i2), (i2, i3), (i1, i3)])
+    # count every edge of the (T, 3) triangles, sorted so (i, j) and (j, i) are the same edge
+    edges = np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [0, 2]]]), axis=1)
+    edges, counts = np.unique(edges, axis=0, return_counts=True)
     
-    boundary = np.unique([edge for edge, count in edge_counter.items() if count == 1])
-    inner = np.setdiff1d(np.arange(n), boundary)
+    # edges used by a single triangle form the boundary; keep them as (k, 2) edges
+    boundary_edges = edges[counts == 1]
+    is_boundary = np.zeros(n, dtype=bool)
+    is_boundary[boundary_edges.ravel()] = True
     
     all_x = np.concatenate([x, x])
     all_y = np.concatenate([y, y])
     all_z = np.concatenate([surface1(x, y), surface2(x, y)])
-    all_triangles = np.concatenate([triangles, [[i if i in boundary else i+n for i in v] for v in triangles]])
+    # the second surface reuses the boundary vertices (closing the surface), the others are shifted by n
+    remap = np.where(is_boundary, np.arange(n), np.arange(n) + n)
+    all_triangles = np.concatenate([triangles, remap[triangles]])
     
     return all_x, all_y, all_z, all_triangles
 
@@ -128,13 +131,23 @@ def delaunay_volume_mesh(points):
 
 def extract_boundary_faces(tetrahedra):
     """Extracts faces that appear exactly once in the tetrahedral mesh."""
-    face_counter = Counter()
-    for vertices in tetrahedra:
-        i1, i2, i3, i4 = sorted(vertices)
-        face_counter.update([(i1, i2, i3), (i1, i2, i4), (i1, i3, i4), (i2, i3, i4)])
-
-    boundary_faces = [face for face, count in face_counter.items() if count == 1]
-    return np.array(boundary_faces)
+    T = np.asarray(tetrahedra)
+    if T.size == 0:
+        return np.empty((0, 3), dtype=T.dtype)
+    # all 4 faces of every tetrahedron as a (4T, 3) array, sorted so shared faces compare equal
+    faces = np.concatenate([T[:, [0, 1, 2]], T[:, [0, 1, 3]], T[:, [0, 2, 3]], T[:, [1, 2, 3]]], axis=0)
+    faces.sort(axis=1)
+    n = np.int64(T.max()) + 1
+    if n < 2**21:
+        # one int64 key per face, exact below 2**21 vertices; a 1-D unique is much faster than axis=0
+        keys = (faces[:, 0] * n + faces[:, 1]) * n + faces[:, 2]
+        _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    else:
+        # the key would overflow int64, compare the rows instead
+        _, first, counts = np.unique(faces, axis=0, return_index=True, return_counts=True)
+
+    boundary_faces = faces[first[counts == 1]]
+    return boundary_faces
 
 # -----------------------
 # 5. Extract Surface Mesh (Step d)